@@ -1,6 +1,7 @@
 import io
 import json
 import typing as t
+from operator import attrgetter
 
 from attrs import asdict
 
@@ -87,15 +88,14 @@ def wu_slot_to_mech_slot(slot: str) -> str:
     return _slot_for_slot.get(slot, slot)
 
 
-def mech_items_in_wu_order(mech: Mech) -> t.Iterator[AnyInvItem | None]:
-    yield mech.torso
-    yield mech.legs
-    yield from mech.iter_items(weapons=True)
-    yield mech.drone
-    yield mech.charge
-    yield mech.tele
-    yield mech.hook
-    yield from mech.iter_items(modules=True)
+# reads all of mech's slots in WU order within a single call
+_wu_order_getter: t.Callable[[Mech], tuple[AnyInvItem | None, ...]] = attrgetter(
+    *map(wu_slot_to_mech_slot, WU_SLOT_NAMES + WU_MODULE_SLOT_NAMES)
+)
+
+
+def mech_items_in_wu_order(mech: Mech) -> tuple[AnyInvItem | None, ...]:
+    return _wu_order_getter(mech)
 
 
 def iter_mech_item_ids(mech: Mech) -> t.Iterator[int]:
@@ -104,7 +104,9 @@ def iter_mech_item_ids(mech: Mech) -> t.Iterator[int]:
 
 def mech_to_id_str(mech: Mech, sep: str = "_") -> str:
     """Helper function to serialize a mech into a string of item IDs."""
-    return sep.join(map(str, iter_mech_item_ids(mech)))
+    return sep.join(
+        ["0" if item is None else str(item.id) for item in mech_items_in_wu_order(mech)]
+    )
 
 
 def export_mech(mech: Mech) -> WUMech:
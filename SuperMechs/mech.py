@@ -29,6 +29,14 @@ WEAPON_SLOTS = ("side1", "side2", "side3", "side4", "top1", "top2")
 SPECIAL_SLOTS = ("tele", "charge", "hook")
 MODULE_SLOTS = ("mod1", "mod2", "mod3", "mod4", "mod5", "mod6", "mod7", "mod8")
 _SLOTS_SET = frozenset(BODY_SLOTS).union(WEAPON_SLOTS, SPECIAL_SLOTS, MODULE_SLOTS)
+# odd numbered weapon slots display the alternate icon
+_ALT_ICON_SLOTS = frozenset(slot for slot in WEAPON_SLOTS if int(slot[-1]) % 2 == 1)
+
+# default print_stats line of each stat, split around the place for the value
+_STAT_LINE_PARTS = {key: (f"{stat.emoji} **", f"** {stat.name}") for key, stat in STATS.items()}
+
+# types of items not counted towards the dominant element
+_UNCOUNTED_TYPES = frozenset((Type.CHARGE_ENGINE, Type.TELEPORTER, Type.MODULE))
 
 
 # -------------------------------- Converters ---------------------------------
@@ -46,23 +54,31 @@ def _type_to_partial_slot(type: Type) -> str:
     return _type_to_slot_lookup.get(type) or type.name.lower()
 
 
-def slot_to_type(slot: str) -> Type:
-    """Convert slot literal to corresponding type enum."""
-    if slot.startswith("side"):
-        return Type.SIDE_WEAPON
-
-    if slot.startswith("top"):
-        return Type.TOP_WEAPON
+_slot_to_type_lookup: dict[str, Type] = {
+    "torso": Type.TORSO,
+    "legs": Type.LEGS,
+    "drone": Type.DRONE,
+    "side1": Type.SIDE_WEAPON,
+    "side2": Type.SIDE_WEAPON,
+    "side3": Type.SIDE_WEAPON,
+    "side4": Type.SIDE_WEAPON,
+    "top1": Type.TOP_WEAPON,
+    "top2": Type.TOP_WEAPON,
+    "tele": Type.TELEPORTER,
+    "charge": Type.CHARGE,
+    "hook": Type.HOOK,
+    **dict.fromkeys(MODULE_SLOTS, Type.MODULE),
+}
 
-    if slot.startswith("mod"):
-        return Type.MODULE
 
-    return Type[slot.upper()]
+def slot_to_type(slot: str) -> Type:
+    """Convert slot literal to corresponding type enum."""
+    return _slot_to_type_lookup[slot]
 
 
 def slot_to_icon_data(slot: str) -> IconData:
     """Same as slot_to_type but returns alternate icon for items mounted on the right side."""
-    if slot.startswith(("top", "side")) and int(slot[-1]) % 2 == 1:
+    if slot in _ALT_ICON_SLOTS:
         return slot_to_type(slot).alt
 
     return slot_to_type(slot)
@@ -108,6 +124,13 @@ def get_weight_utilization_emoji(mech: Mech, weight: int) -> str:
     return " " + weight_usage
 
 
+def _no_extra(mech: Mech, value: int) -> str:
+    return ""
+
+
+_DEFAULT_EXTRA: dict[str, t.Callable[[Mech, int], str]] = {"weight": get_weight_utilization_emoji}
+
+
 # -------------------------------- Constraints --------------------------------
 
 
@@ -152,6 +175,8 @@ def is_valid_type(
 
 class _MechCache(t.TypedDict, total=False):
     stats: dict[str, int]
+    # default-formatted print_stats output, keyed by the applied buff levels
+    printed_stats: dict[tuple[tuple[str, int], ...] | None, str]
     image: Image
     dominant_element: Element | None
 
@@ -165,6 +190,8 @@ class Mech:
     game_vars: GameVars = GameVars.default()
     constraints: dict[UUID, t.Callable[[Self], bool]] = field(factory=dict, init=False)
     _cache: _MechCache = field(factory=dict, init=False, repr=False, eq=False)
+    # incremented each time an item is set, allows others to cache data derived from the items
+    revision: int = field(default=0, init=False, repr=False, eq=False)
 
     # fmt: off
     torso:  SlotType[Attachments] = field(default=None, validator=is_valid_type)
@@ -215,6 +242,7 @@ class Mech:
 
         self.try_invalidate_cache(item, self[slot])
         setattr(self, slot, item)
+        self.revision += 1
 
     def __getitem__(self, slot: XOrTupleXY[str | Type, int]) -> AnyInvItem | None:
         return getattr(self, slot_name_converter(slot))
@@ -299,9 +327,13 @@ class Mech:
     @stats.deleter
     def stats(self) -> None:
         self._cache.pop("stats", None)
+        self._cache.pop("printed_stats", None)
 
     def get_sorted_stats(self) -> list[tuple[str, int]]:
-        return sorted(self.stats.items(), key=lambda stat: WORKSHOP_STATS.index(stat[0]))
+        # stats are only ever gathered from WORKSHOP_STATS, so walking it in order
+        # yields them sorted without a sort & per-key index scan
+        stats = self.stats
+        return [(stat, stats[stat]) for stat in WORKSHOP_STATS if stat in stats]
 
     def get_buffed_stats(self, buffs: ArenaBuffs, /) -> t.Iterator[tuple[str, int]]:
         for stat, value in self.get_sorted_stats():
@@ -325,12 +357,28 @@ class Mech:
                         * `stat` - a `Stat` object.
                         * `value` - the integer value of the stat.
                         * `extra` - any extra data coming from a callable from the `extra` param.
+
+        The output for the default `line_format` and `extra` is cached until the mech changes.
         """
-        if line_format is None:
-            line_format = "{stat.emoji} **{value}** {stat.name}{extra}"
+        if line_format is None and extra is None:
+            key = None if included_buffs is None else tuple(included_buffs.levels.items())
+            printed = self._cache.setdefault("printed_stats", {})
+
+            if (string := printed.get(key)) is None:
+                string = printed[key] = self._format_stats(included_buffs)
+
+            return string
 
+        return self._format_stats(included_buffs, line_format, extra)
+
+    def _format_stats(
+        self,
+        included_buffs: ArenaBuffs | None = None,
+        line_format: str | None = None,
+        extra: dict[str, t.Callable[[Mech, int], str]] | None = None,
+    ) -> str:
         if extra is None:
-            extra = {"weight": get_weight_utilization_emoji}
+            extra = _DEFAULT_EXTRA
 
         if included_buffs is None:
             bank = self.get_sorted_stats()
@@ -338,11 +386,23 @@ class Mech:
         else:
             bank = self.get_buffed_stats(included_buffs)
 
+        if line_format is None:
+            # the default format, spelled out as an f-string so that
+            # no template has to be parsed for each line
+            lines: list[str] = []
+
+            for stat_name, value in bank:
+                head, tail = _STAT_LINE_PARTS[stat_name]
+                extra_str = extra.get(stat_name, _no_extra)(self, value)
+                lines.append(f"{head}{value}{tail}{extra_str}")
+
+            return "\n".join(lines)
+
         return "\n".join(
             line_format.format(
                 value=value,
                 stat=STATS[stat_name],
-                extra=extra.get(stat_name, lambda mech, value: "")(self, value),
+                extra=extra.get(stat_name, _no_extra)(self, value),
             )
             for stat_name, value in bank
         )
@@ -358,6 +418,10 @@ class Mech:
         self._cache["image"] = image = canvas.merge()
         return image
 
+    @image.setter
+    def image(self, image: Image) -> None:
+        self._cache["image"] = image
+
     @image.deleter
     def image(self) -> None:
         self._cache.pop("image", None)
@@ -375,7 +439,11 @@ class Mech:
         elif old is not None and old.type.displayable:
             del self.image
 
-        if new is None or old is None or new.element is not old.element:
+        # items of uncounted types cannot change the dominant element
+        new_element = None if new is None or new.type in _UNCOUNTED_TYPES else new.element
+        old_element = None if old is None or old.type in _UNCOUNTED_TYPES else old.element
+
+        if new_element is not old_element:
             self._cache.pop("dominant_element", None)
 
     @property
@@ -384,6 +452,14 @@ class Mech:
         Does not check if the cache has been changed."""
         return "image" in self._cache
 
+    @property
+    def image_key(self) -> tuple[int, ...]:
+        """IDs of the items drawn on the image, with 0 for empty slots.
+        Mechs from the same pack with equal keys render the same image."""
+        return tuple(
+            0 if item is None else item.id for item in self.iter_items(body=True, weapons=True)
+        )
+
     @t.overload
     def iter_items(self, *, slots: t.Literal[False] = False) -> t.Iterator[AnyInvItem | None]:
         ...
@@ -510,15 +586,15 @@ class Mech:
 
     def get_dominant_element(self) -> Element | None:
         """Guesses the mech type by equipped items."""
-        if (element := self._cache.get("dominant_element")) is not None:
-            return element
+        # None is a valid result too, so test for the key rather than the value
+        if "dominant_element" in self._cache:
+            return self._cache["dominant_element"]
 
-        excluded = {Type.CHARGE_ENGINE, Type.TELEPORTER, Type.MODULE}
         elements = Counter(
             item.element
             for item in self.iter_items()
             if item is not None
-            if item.type not in excluded
+            if item.type not in _UNCOUNTED_TYPES
         ).most_common(2)
 
         # return None when there are no elements
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import typing as t
 import uuid
+from bisect import bisect_left
+from types import MappingProxyType
 
-from attrs import Factory, define
+from attrs import Factory, define, field
 
 from .core import ArenaBuffs
 from .inv_item import AnyInvItem
@@ -18,7 +21,7 @@ class Player:
 
     id: int
     name: str
-    builds: dict[str, Mech] = Factory(dict)
+    _builds: dict[str, Mech] = Factory(dict)
     teams: dict[str, list[Mech]] = Factory(dict)
     arena_buffs: ArenaBuffs = Factory(ArenaBuffs)
     inventory: dict[uuid.UUID, AnyInvItem] = Factory(dict)
@@ -26,6 +29,15 @@ class Player:
     active_team_name: str = MISSING
     level: int = 0
     exp: int = 0
+    # (lowercased name, name) of builds, sorted; rebuilt lazily after the builds change
+    _build_index: list[tuple[str, str]] | None = field(
+        default=None, init=False, repr=False, eq=False
+    )
+
+    @property
+    def builds(self) -> MappingProxyType[str, Mech]:
+        """The player's builds by name. Read-only, the methods below change them."""
+        return MappingProxyType(self._builds)
 
     def get_or_create_active_build(self, possible_name: str | None = None, /) -> Mech:
         """Retrieves active build if the player has one, otherwise creates a new one.
@@ -37,11 +49,11 @@ class Player:
         if self.active_build_name is MISSING:
             return self.create_build(possible_name)
 
-        return self.builds[self.active_build_name]
+        return self._builds[self.active_build_name]
 
     def get_active_build(self) -> Mech | None:
         """Returns active build if the player has one, `None` otherwise."""
-        return self.builds.get(self.active_build_name)
+        return self._builds.get(self.active_build_name)
 
     def create_build(self, name: str | None = None, /) -> Mech:
         """Creates a new build, sets it as active and returns it.
@@ -54,17 +66,54 @@ class Player:
 
         if name is None:
             n = 1
-            while (name := f"Unnamed Mech {n}") in self.builds:
+            while (name := f"Unnamed Mech {n}") in self._builds:
                 n += 1
 
         else:
             name = truncate_name(name)
 
         build = Mech(name=name)
-        self.builds[name] = build
+        self._builds[name] = build
         self.active_build_name = name
+        self._build_index = None
         return build
 
+    def add_builds(self, builds: t.Iterable[Mech], /) -> None:
+        """Adds builds under their names, replacing existing builds of the same name.
+
+        Parameters
+        -----------
+        builds: The builds to add.
+        """
+        self._builds.update({build.name: build for build in builds})
+        self._build_index = None
+
+    def find_build_names(self, prefix: str, /, limit: int | None = None) -> list[str]:
+        """Returns the names of builds starting with a prefix, ignoring case.
+
+        Parameters
+        -----------
+        prefix: The prefix to look for.
+        limit: The maximum number of names to return. If `None`, returns all of them.
+        """
+        if self._build_index is None:
+            self._build_index = sorted((name.lower(), name) for name in self._builds)
+
+        prefix = prefix.lower()
+        index = self._build_index
+        names: list[str] = []
+
+        # matching names are adjacent in the index, starting where the prefix would go
+        for i in range(bisect_left(index, (prefix,)), len(index)):
+            lowered, name = index[i]
+
+            if not lowered.startswith(prefix) or len(names) == limit:
+                break
+
+            names.append(name)
+
+        return names
+
     def rename_build(self, old_name: str, new_name: str, *, overwrite: bool = False) -> None:
         """Changes the name a build is assigned to.
 
@@ -73,15 +122,16 @@ class Player:
         old_name: The name of an existing build to be changed.
         new_name: A new name for the build.
         """
-        if old_name not in self.builds:
+        if old_name not in self._builds:
             raise ValueError("Build not found")
 
         new_name = truncate_name(new_name)
 
-        if new_name in self.builds and not overwrite:
+        if new_name in self._builds and not overwrite:
             raise ValueError("Provided name is already in use")
 
-        self.builds[new_name] = self.builds.pop(old_name)
+        self._builds[new_name] = self._builds.pop(old_name)
+        self._build_index = None
 
     def delete_build(self, name: str, /) -> None:
         """Deletes build from player's builds.
@@ -90,7 +140,8 @@ class Player:
         ----------
         name: The name of the build to delete.
         """
-        if name not in self.builds:
+        if name not in self._builds:
             raise ValueError("Build not found")
 
-        del self.builds[name]
+        del self._builds[name]
+        self._build_index = None
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import json
 import logging
 import typing as t
+from collections import OrderedDict
+from functools import partial
+from itertools import islice
 
 from disnake import (
     Attachment,
@@ -18,7 +22,7 @@ from disnake import (
 from disnake.ext import commands
 from disnake.utils import MISSING
 
-from app.lib_helpers import DesyncError, image_to_file
+from app.lib_helpers import DesyncError, encode_image
 from app.ui.buttons import Button, ToggleButton, TrinaryButton, button
 from app.ui.item import add_callback
 from app.ui.selects import EMPTY_OPTION, PaginatedSelect, Select, select
@@ -35,6 +39,8 @@ from SuperMechs.player import Player
 from SuperMechs.utils import truncate_name
 
 if t.TYPE_CHECKING:
+    from PIL.Image import Image
+
     from app.bot import SMBot
 
 MixedInteraction = CommandInteraction | MessageInteraction
@@ -45,11 +51,158 @@ T = t.TypeVar("T")
 # due to the command being registered in test guilds only
 BUFFS_COMMAND_ID = 919329829227229196
 
+# the maximum number of options a select can hold
+OPTION_LIMIT = 25
+
+# (row, slot, emoji) of slot buttons in the order they are laid out in the mech editor
+_BUTTON_LAYOUT: tuple[tuple[int, str, str], ...] = tuple(
+    (row, slot, slot_to_icon_data(slot).emoji)
+    for row, slots in enumerate(
+        (
+            ("top1", "drone", "top2", "charge", "mod1", "mod2", "mod3", "mod4"),
+            ("side3", "torso", "side4", "tele", "mod5", "mod6", "mod7", "mod8"),
+            ("side1", "legs", "side2", "hook"),
+        )
+    )
+    for slot in slots
+)
+# rendered mech images shared between views showing the same items, least recently used first
+_mech_images: OrderedDict[tuple[str, tuple[int, ...]], Image] = OrderedDict()
+_MECH_IMAGES_SIZE = 16
+
+
+def filler_buttons(row: int, count: int) -> list[Button[None]]:
+    """Creates disabled, blank buttons used to pad a row."""
+    return [
+        Button(label="⠀", custom_id=f"button:no_op{i}", disabled=True, row=row)
+        for i in range(count)
+    ]
+
+
+def get_mech_image(mech: Mech, pack: PackInterface) -> Image:
+    """Returns the mech's image, reusing a render of the same items from the same pack."""
+    if mech.has_image_cached:
+        return mech.image
+
+    key = (pack.key, mech.image_key)
+
+    if (image := _mech_images.get(key)) is not None:
+        _mech_images.move_to_end(key)
+        mech.image = image
+
+    else:
+        image = _mech_images[key] = mech.image
+
+        if len(_mech_images) > _MECH_IMAGES_SIZE:
+            _mech_images.popitem(last=False)
+
+    return image
+
+
+# item options of each loaded pack, keyed by pack key
+_pack_item_groups: dict[str, dict[Type, dict[Element, list[SelectOption]]]] = {}
+
+
+def get_item_groups(pack: PackInterface) -> dict[Type, dict[Element, list[SelectOption]]]:
+    """Returns the pack's item options grouped by type, then by element in the default
+    order, each group sorted by name. Built once per pack; must not be mutated."""
+    if (groups := _pack_item_groups.get(pack.key)) is not None:
+        return groups
+
+    groups = _pack_item_groups[pack.key] = {
+        type: {element: [] for element in Element} for type in Type
+    }
+
+    for item in sorted(pack.items.values(), key=lambda item: item.name):
+        groups[item.type][item.element].append(
+            SelectOption(label=item.name, emoji=item.element.emoji)
+        )
+
+    return groups
+
+
+# dropdown options, keyed by pack key, item type & the element they prioritize
+_sorted_options: dict[tuple[str, Type, Element | None], list[SelectOption]] = {}
+
+
+def get_sorted_options(
+    pack: PackInterface, item_type: Type, dominant: Element | None
+) -> list[SelectOption]:
+    """Returns the options of given item type preceded by `EMPTY_OPTION`, with items
+    of the dominant element first. Cached per arguments; must not be mutated."""
+    groups = get_item_groups(pack)[item_type]
+
+    if dominant is not None and dominant is next(iter(groups)):
+        # already first in the default order, no need to cache it separately
+        dominant = None
+
+    if (options := _sorted_options.get((pack.key, item_type, dominant))) is not None:
+        return options
+
+    options = _sorted_options[pack.key, item_type, dominant] = [EMPTY_OPTION]
+
+    # groups are already in order, so only the dominant one has to be moved in front
+    if dominant is not None:
+        options += groups[dominant]
+
+    for element, group in groups.items():
+        if element is not dominant:
+            options += group
+
+    return options
+
+
+# PNG-encoded mech images keyed like _mech_images, least recently used first
+_encoded_images: OrderedDict[tuple[str, tuple[int, ...]], bytes] = OrderedDict()
+_ENCODED_IMAGES_SIZE = 16
+# encodings still running in a worker thread; moved to _encoded_images once finished
+_pending_encodings: dict[tuple[str, tuple[int, ...]], asyncio.Future[bytes]] = {}
+
+
+def _finish_encoding(key: tuple[str, tuple[int, ...]], encoding: asyncio.Future[bytes]) -> None:
+    del _pending_encodings[key]
+
+    # a failed encoding is not stored, so that the next call retries it
+    if encoding.cancelled() or encoding.exception() is not None:
+        return
+
+    _encoded_images[key] = encoding.result()
+
+    if len(_encoded_images) > _ENCODED_IMAGES_SIZE:
+        _encoded_images.popitem(last=False)
+
+
+async def mech_image_to_file(mech: Mech, pack: PackInterface, id_str: str) -> File:
+    """Creates a `disnake.File` of the mech's image named after its ID string.
+    The encoded image is shared by mechs drawing the same items from the same pack."""
+    key = (pack.key, mech.image_key)
+
+    if (data := _encoded_images.get(key)) is not None:
+        _encoded_images.move_to_end(key)
+        return File(io.BytesIO(data), id_str + ".png")
+
+    # the image is shared by every mech with this key, so it must never be
+    # encoded by two threads at once; later callers wait for the running encoding
+    if (encoding := _pending_encodings.get(key)) is None:
+        encoding = _pending_encodings[key] = asyncio.ensure_future(
+            asyncio.to_thread(encode_image, get_mech_image(mech, pack))
+        )
+        encoding.add_done_callback(partial(_finish_encoding, key))
+
+    # a cancelled update_image must not cancel an encoding others wait for
+    data = await asyncio.shield(encoding)
+    return File(io.BytesIO(data), id_str + ".png")
+
+
+def embed_mech(
+    mech: Mech, included_buffs: ArenaBuffs | None = None, *, color: int | None = None
+) -> Embed:
+    if color is None:
+        color = (mech.get_dominant_element() or Element.OMNI).color
 
-def embed_mech(mech: Mech, included_buffs: ArenaBuffs | None = None) -> Embed:
     embed = Embed(
         title=f'Mech build "{mech.name}"',
-        color=(mech.get_dominant_element() or Element.OMNI).color
+        color=color
     ).add_field("Stats:", mech.print_stats(included_buffs))
     return embed
 
@@ -66,6 +219,7 @@ class MechView(InteractionCheck, PaginatorView):
         player: Player,
         *,
         timeout: float = 180.0,
+        color: int | None = None,
     ) -> None:
         super().__init__(timeout=timeout, columns=5)
         self.pack = pack
@@ -74,47 +228,46 @@ class MechView(InteractionCheck, PaginatorView):
         self.user_id = player.id
 
         self.active: TrinaryButton[AnyItem] | None = None
-        self.image_update_task = asyncio.Task(asyncio.sleep(0))
-        self.embed = embed_mech(mech)
-
-        for pos, row in enumerate(
-            (
-                ("top1", "drone", "top2", "charge", "mod1", "mod2", "mod3", "mod4"),
-                ("side3", "torso", "side4", "tele", "mod5", "mod6", "mod7", "mod8"),
-                ("side1", "legs", "side2", "hook"),
-            )
-        ):
-            self.rows[pos].extend_page_items(
+        # (mech revision, ID string) of the last computed ID string
+        self._id_str: tuple[int, str] = (-1, "")
+        self.image_update_task: asyncio.Task[None] | None = None
+
+        if color is None:
+            color = (mech.get_dominant_element() or Element.OMNI).color
+
+        self.embed = embed_mech(mech, color=color)
+        # the color last written to the embed, to skip rewriting the same one
+        self._color = color
+
+        for row, slot, emoji in _BUTTON_LAYOUT:
+            self.rows[row].extend_page_items(
                 add_callback(
                     TrinaryButton(
-                        custom_id=id,
-                        item=mech[id],
-                        emoji=slot_to_icon_data(id).emoji,
-                        row=pos,
+                        custom_id=slot,
+                        # layout slots are valid names, no need to go through the converter
+                        item=getattr(mech, slot),
+                        emoji=emoji,
+                        row=row,
                     ),
                     self.slot_button_cb,
                 )
-                for id in row
             )
 
-        self.rows[2].extend_page_items(
-            Button(label="⠀", custom_id=f"button:no_op{i}", disabled=True, row=2) for i in range(4)
-        )
+        self.rows[2].extend_page_items(filler_buttons(2, 4))
 
         # property updates the rows
         self.page = 0
 
-        self.item_groups: dict[Type, list[SelectOption]] = {type: [] for type in Type}
-
-        for item in pack.items.values():
-            self.item_groups[item.type].append(
-                SelectOption(label=item.name, emoji=item.element.emoji)
-            )
+    @property
+    def mech_id_str(self) -> str:
+        """The item ID string of the mech, recomputed only after the mech changes."""
+        revision, id_str = self._id_str
 
-        ref = [element.emoji for element in Element]
+        if revision != self.mech.revision:
+            id_str = mech_to_id_str(self.mech)
+            self._id_str = (self.mech.revision, id_str)
 
-        for item_list in self.item_groups.values():
-            item_list.sort(key=lambda option: (ref.index(str(option.emoji)), option.label))
+        return id_str
 
     async def slot_button_cb(
         self,
@@ -147,13 +300,7 @@ class MechView(InteractionCheck, PaginatorView):
             return
 
         button.toggle()
-        assert self.embed._fields is not None
-        self.embed._fields[0]
-        self.embed.set_field_at(
-            0,
-            name=self.embed.fields[0].name,
-            value=self.mech.print_stats(self.player.arena_buffs if button.on else None),
-        )
+        self.update_stats_field()
 
         await inter.response.edit_message(embed=self.embed, view=self)
 
@@ -204,27 +351,32 @@ class MechView(InteractionCheck, PaginatorView):
         if item is not None:
             item = InvItem.from_item(item, maxed=True)
 
+        # the mapping this refers to is replaced, not mutated, once the mech changes
+        old_stats = self.mech.stats
         self.mech[self.active.custom_id] = item
 
         if (dominant := self.mech.get_dominant_element()) is not None:
-            self.embed.color = dominant.color
+            self.set_embed_color(dominant.color)
 
         elif self.mech.torso is not None:
-            self.embed.color = self.mech.torso.element.color
+            self.set_embed_color(self.mech.torso.element.color)
 
         elif self.active.custom_id == "torso" and item is None:
-            self.embed.color = Element.OMNI.color
+            self.set_embed_color(Element.OMNI.color)
 
         self.update_style(self.active)
 
-        self.embed.set_field_at(
-            0,
-            name="Stats:",
-            value=self.mech.print_stats(self.player.arena_buffs if self.buffs_button.on else None),
-        )
+        # e.g. swapping between modules of equal stats
+        if self.mech.stats != old_stats:
+            self.update_stats_field()
 
         await inter.response.edit_message(embed=self.embed, view=self)
 
+    def set_embed_color(self, color: int) -> None:
+        """Sets the embed's color, unless it already has it."""
+        if color != self._color:
+            self.embed.color = self._color = color
+
     async def update_image(self) -> None:
         """Background task to update embed's image."""
         if self.mech.has_image_cached:
@@ -232,27 +384,27 @@ class MechView(InteractionCheck, PaginatorView):
 
         await asyncio.sleep(2.0)
 
-        file = image_to_file(self.mech.image, mech_to_id_str(self.mech))
+        file = await mech_image_to_file(self.mech, self.pack, self.mech_id_str)
         self.embed.set_image(url=f"attachment://{file.filename}")
         await self.response_message.edit(embed=self.embed, file=file, attachments=[])
 
     def sort_options(self, item_type: Type) -> list[SelectOption]:
         """Returns a list of `SelectOption`s filtered by type"""
-        all_options = self.item_groups[item_type]
-        new_options = [EMPTY_OPTION]
-
-        if len(all_options) <= 24:
-            return new_options + all_options
+        options = get_sorted_options(self.pack, item_type, None)
 
-        ref = [element.emoji for element in Element]
+        # the order only needs adjusting when the options span multiple pages
+        if len(options) > OPTION_LIMIT:
+            return get_sorted_options(self.pack, item_type, self.mech.get_dominant_element())
 
-        if (dominant := self.mech.get_dominant_element()) is not None:
-            ref.remove(dominant.emoji)
-            ref.insert(0, dominant.emoji)
-
-        new_options += sorted(all_options, key=lambda o: (ref.index(str(o.emoji)), o.label))
+        return options
 
-        return new_options
+    def update_stats_field(self) -> None:
+        """Updates the embed's stats field to match the mech & buffs button state."""
+        assert self.embed._fields is not None
+        # set_field_at would also reassign the name & inline flags, only the value changes
+        self.embed._fields[0]["value"] = self.mech.print_stats(
+            self.player.arena_buffs if self.buffs_button.on else None
+        )
 
     def update_style(self, button: TrinaryButton[AnyItem], /) -> None:
         """Changes active button, alters its and passed button's style,
@@ -266,7 +418,8 @@ class MechView(InteractionCheck, PaginatorView):
             self.image_update_task = asyncio.create_task(self.update_image())
             return
 
-        self.image_update_task.cancel()
+        if self.image_update_task is not None:
+            self.image_update_task.cancel()
 
         if self.active is None:
             self.item_select.disabled = False
@@ -334,35 +487,25 @@ class MechManager(commands.Cog):
         if player.active_build_name:
             embed.description = f"Currently active: **{player.active_build_name}**"
 
-        fields: list[tuple[str, str]] = []
-
-        def count_not_none(it: t.Iterable[t.Any | None]) -> int:
-            i = 0
-            for item in it:
-                if item is not None:
-                    i += 1
-            return i
-
-        fmt_string = (
-            f"• {Type.TORSO.emoji} {{TORSO}}\n"
-            f"• {Type.LEGS.emoji} {{LEGS}}\n"
-            f"• {Type.SIDE_WEAPON.emoji} {{WEAPONS}} weapon(s)\n"
-            f"• {Type.MODULE.emoji} {{MODULES}} module(s)\n"
-            f"• {STATS['weight'].emoji} {{WEIGHT}} weight"
-        )
+        torso_emoji = Type.TORSO.emoji
+        legs_emoji = Type.LEGS.emoji
+        weapon_emoji = Type.SIDE_WEAPON.emoji
+        module_emoji = Type.MODULE.emoji
+        weight_emoji = STATS["weight"].emoji
 
         for name, build in player.builds.items():
-            value = fmt_string.format(
-                TORSO="no torso" if build.torso is None else build.torso.name,
-                LEGS="no legs" if build.legs is None else build.legs.name,
-                WEAPONS=count_not_none(build.iter_items(weapons=True)),
-                MODULES=count_not_none(build.iter_items(modules=True)),
-                WEIGHT=build.weight,
+            torso = "no torso" if build.torso is None else build.torso.name
+            legs = "no legs" if build.legs is None else build.legs.name
+            weapons = sum(item is not None for item in build.iter_items(weapons=True))
+            modules = sum(item is not None for item in build.iter_items(modules=True))
+            embed.add_field(
+                name,
+                f"• {torso_emoji} {torso}\n"
+                f"• {legs_emoji} {legs}\n"
+                f"• {weapon_emoji} {weapons} weapon(s)\n"
+                f"• {module_emoji} {modules} module(s)\n"
+                f"• {weight_emoji} {build.weight} weight",
             )
-            fields.append((name, value))
-
-        for title, value in fields:
-            embed.add_field(title, value)
 
         await inter.send(embed=embed, ephemeral=True)
 
@@ -387,13 +530,13 @@ class MechManager(commands.Cog):
             mech = player.builds[name]
             player.active_build_name = mech.name
 
-        view = MechView(mech, self.bot.default_pack, player, timeout=100)
+        # the torso's element colors the embed of an opened build
+        color = None if mech.torso is None else mech.torso.element.color
+        view = MechView(mech, self.bot.default_pack, player, timeout=100, color=color)
         file = MISSING
 
         if mech.torso is not None:
-            view.embed.color = mech.torso.element.color
-
-            file = image_to_file(mech.image, mech_to_id_str(mech))
+            file = await mech_image_to_file(mech, view.pack, view.mech_id_str)
             url = f"attachment://{file.filename}"
             view.embed.set_image(url)
 
@@ -420,6 +563,9 @@ class MechManager(commands.Cog):
         # file size of 16KiB sounds like a pretty beefy amount of mechs
         MAX_SIZE = 1 << 14
 
+        if not file.filename.lower().endswith(".json"):
+            raise commands.UserInputError("Only .JSON files are accepted.")
+
         if MAX_SIZE < file.size:
             raise commands.UserInputError(f"The maximum accepted file size is {MAX_SIZE >> 10}KiB.")
 
@@ -436,7 +582,7 @@ class MechManager(commands.Cog):
 
         else:
             # TODO: warn about overwriting
-            player.builds.update((mech.name, mech) for mech in mechs)
+            player.add_builds(mechs)
             message = "Loaded mechs: " + ", ".join(f"`{mech.name}`" for mech in mechs)
 
         if failed:
@@ -456,8 +602,8 @@ class MechManager(commands.Cog):
         mech_select = Select(
             placeholder="Select mechs to export",
             custom_id="select:exported_mechs",
-            max_values=min(25, len(player.builds)),
-            options=list(player.builds)[:25],
+            max_values=min(OPTION_LIMIT, len(player.builds)),
+            options=list(islice(player.builds, OPTION_LIMIT)),
         )
         await inter.send(components=mech_select, ephemeral=True)
 
@@ -467,9 +613,9 @@ class MechManager(commands.Cog):
         new_inter: MessageInteraction = await inter.bot.wait_for("dropdown", check=check)
         values = new_inter.values
         assert values is not None
-        selected = frozenset(values)
 
-        mechs = (mech for name, mech in player.builds.items() if name in selected)
+        # a build may have been removed or renamed while the select was open
+        mechs = [player.builds[name] for name in values if name in player.builds]
         fp = dump_mechs(mechs, self.bot.default_pack.key)
         file = File(fp, "mechs.json")  # type: ignore
         await new_inter.response.edit_message(file=file, components=None)
@@ -481,8 +627,7 @@ class MechManager(commands.Cog):
         """Autocomplete for player builds."""
         player = self.bot.get_player(inter)
         input = truncate_name(input)
-        case_insensitive = input.lower()
-        return [name for name in player.builds if name.lower().startswith(case_insensitive)] or {
+        return player.find_build_names(input, OPTION_LIMIT) or {
             f'Enter to create mech "{input}"...': input
         }
 
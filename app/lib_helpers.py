@@ -37,6 +37,13 @@ def str_to_file(
     return disnake.File(file, filename)  # pyright: ignore[reportGeneralTypeIssues]
 
 
+def encode_image(image: Image, format: str = "png") -> bytes:
+    """Encodes `PIL.Image.Image` into the given format."""
+    stream = io.BytesIO()
+    image.save(stream, format=format)
+    return stream.getvalue()
+
+
 def image_to_file(image: Image, filename: str | None = None, format: str = "png") -> File:
     """Creates a `disnake.File` object from `PIL.Image.Image`."""
     # not using with as the stream is closed by the File object
@@ -48,10 +55,7 @@ def image_to_file(image: Image, filename: str | None = None, format: str = "png"
         if not filename.endswith(ext):
             filename += ext
 
-    stream = io.BytesIO()
-    image.save(stream, format=format)
-    stream.seek(0)
-    return File(stream, filename)
+    return File(io.BytesIO(encode_image(image, format)), filename)
 
 
 class FileRecord(logging.LogRecord):
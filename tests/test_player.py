@@ -0,0 +1,62 @@
+import pytest
+
+from SuperMechs.mech import Mech
+from SuperMechs.player import Player
+
+
+def make_player(*names: str) -> Player:
+    player = Player(id=0, name="Tester")
+
+    for name in names:
+        player.create_build(name)
+
+    return player
+
+
+def test_find_build_names_prefix() -> None:
+    player = make_player("Bruiser", "Brawler", "Tank", "Br")
+
+    assert player.find_build_names("br") == ["Br", "Brawler", "Bruiser"]
+    assert player.find_build_names("bru") == ["Bruiser"]
+    assert player.find_build_names("x") == []
+    assert player.find_build_names("") == ["Br", "Brawler", "Bruiser", "Tank"]
+
+
+def test_find_build_names_ignores_case() -> None:
+    player = make_player("alpha", "ALPINE", "Beta")
+
+    assert player.find_build_names("AL") == ["alpha", "ALPINE"]
+    assert player.find_build_names("aLp") == ["alpha", "ALPINE"]
+
+
+def test_find_build_names_limit() -> None:
+    player = make_player("a1", "a2", "a3", "b1")
+
+    assert player.find_build_names("a", 2) == ["a1", "a2"]
+    assert player.find_build_names("a", 0) == []
+    assert player.find_build_names("a", None) == ["a1", "a2", "a3"]
+
+
+def test_find_build_names_after_changes() -> None:
+    player = make_player("Alpha", "Beta")
+    assert player.find_build_names("a") == ["Alpha"]
+
+    player.rename_build("Alpha", "Gamma")
+    assert player.find_build_names("a") == []
+    assert player.find_build_names("g") == ["Gamma"]
+
+    player.delete_build("Gamma")
+    assert player.find_build_names("g") == []
+
+    player.create_build("Gizmo")
+    player.add_builds([Mech(name="Golem")])
+    assert player.find_build_names("g") == ["Gizmo", "Golem"]
+
+
+def test_builds_are_read_only() -> None:
+    player = make_player("Alpha")
+
+    with pytest.raises(TypeError):
+        player.builds["Beta"] = Mech(name="Beta")  # type: ignore
+
+    assert list(player.builds) == ["Alpha"]